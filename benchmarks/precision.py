@@ -0,0 +1,71 @@
+"""Speed and accuracy of the precision tiers
+
+Computes topocentric ecliptic positions of the planets for random instants with every tier of
+astrolog.Precision and reports the speedup against full precision and the largest observed error.
+
+    python benchmarks/precision.py --samples 2000 --ephe-path /path/to/ephe
+"""
+import argparse
+import math
+import random
+import sys
+import time
+
+import swisseph as swe
+
+from astrolog import Planet, Precision
+
+BODIES = [Planet.Sun, Planet.Moon, Planet.Mercury, Planet.Venus, Planet.Mars, Planet.Jupiter,
+          Planet.Saturn, Planet.Uranus, Planet.Neptune, Planet.Pluto]
+
+
+def positions(jds: list, precision: Precision) -> (list, float):
+    started = time.perf_counter()
+    coords = [body.swe_ecl_coord(jd, precision=precision) for jd in jds for body in BODIES]
+    return coords, time.perf_counter() - started
+
+
+def check_ephemeris_files(jds: list):
+    # Swiss Ephemeris silently falls back to Moshier when the .se1 files are missing,
+    # which would turn the reference into the Fast tier and every error bound into zero
+    for jd in jds:
+        for body in BODIES:
+            (_, retflag) = body.swe_calc(jd, swe.FLG_TOPOCTR, precision=Precision.Full)
+            if not retflag & swe.FLG_SWIEPH:
+                sys.exit(f"{body.name} at julian day {jd} was not computed from the Swiss Ephemeris files; "
+                         f"pass --ephe-path with the .se1 files covering 1900..2100")
+
+
+def error(coord, reference) -> float:
+    dlng = (coord.longitude.degrees - reference.longitude.degrees + 180.0) % 360.0 - 180.0
+    dlat = coord.latitude.degrees - reference.latitude.degrees
+    return math.hypot(dlng * math.cos(reference.latitude.radians()), dlat) * 3600.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the astrolog precision tiers")
+    parser.add_argument("--samples", type=int, default=1000, help="number of random instants")
+    parser.add_argument("--ephe-path", default=None, help="directory with Swiss Ephemeris files")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.ephe_path:
+        swe.set_ephe_path(args.ephe_path)
+    swe.set_topo(0.0, 51.5)
+
+    rng = random.Random(args.seed)
+    # 1900..2100
+    jds = [2415020.5 + rng.random() * 73050.0 for _ in range(args.samples)]
+    check_ephemeris_files(jds)
+    # open the ephemeris files before timing
+    for precision in Precision.all:
+        positions(jds[:10], precision)
+    (reference, full_time) = positions(jds, Precision.Full)
+    print(f"{'tier':<16}{'time, s':>10}{'speedup':>10}{'max error':>14}")
+    for precision in Precision.all:
+        (coords, elapsed) = positions(jds, precision)
+        worst = max(error(coord, ref) for (coord, ref) in zip(coords, reference))
+        print(f"{precision.name:<16}{elapsed:>10.3f}{full_time / elapsed:>10.2f}{worst:>12.2f} \"")
+
+
+if __name__ == "__main__":
+    main()
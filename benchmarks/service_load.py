@@ -0,0 +1,98 @@
+"""Load test for the local chart service (python -m astrolog.service)
+
+Opens keep-alive connections, fires requests for random charts and positions and reports throughput and
+latency percentiles measured on the client together with the service's own /stats (including the number of
+batches run by every worker process).
+
+    python -m astrolog.service --port 8000 &
+    python benchmarks/service_load.py --port 8000 --concurrency 64 --duration 30
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+ENDPOINTS = ("chart", "position", "aspects", "transits")
+
+
+def random_target(rng: random.Random, locations: int, instants: int) -> str:
+    endpoint = rng.choice(ENDPOINTS)
+    lon = rng.randrange(locations) * 360.0 / locations - 180.0
+    lat = rng.randrange(locations) * 120.0 / locations - 60.0
+    day = rng.randrange(instants)
+    when = f"1990-01-01T{day % 24:02d}:00" if endpoint != "transits" else "1990-01-01"
+    query = f"time={when}&lon={lon}&lat={lat}"
+    if endpoint == "position":
+        query += "&body=" + rng.choice(("Sun", "Moon", "Mercury", "Venus", "Mars"))
+    return f"/{endpoint}?{query}"
+
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, target: str) -> (int, bytes):
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        (key, _, value) = line.decode("latin-1").partition(":")
+        if key.strip().lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def client(host: str, port: int, deadline: float, rng: random.Random, args, latencies: list, errors: list):
+    (reader, writer) = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            target = random_target(rng, args.locations, args.instants)
+            started = time.perf_counter()
+            (status, _) = await request(reader, writer, target)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(target)
+    finally:
+        writer.close()
+
+
+async def run(args):
+    latencies = []
+    errors = []
+    deadline = time.perf_counter() + args.duration
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        client(args.host, args.port, deadline, random.Random(args.seed + k), args, latencies, errors)
+        for k in range(args.concurrency)
+    ])
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+
+    def percentile(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(p / 100.0 * len(latencies)))] * 1000.0
+
+    print(f"requests:   {len(latencies)} ({len(errors)} errors) in {elapsed:.1f} s")
+    print(f"throughput: {len(latencies) / elapsed:.1f} requests/s")
+    if latencies:
+        print(f"latency:    p50 {percentile(50):.2f} ms, p90 {percentile(90):.2f} ms, p99 {percentile(99):.2f} ms")
+    (reader, writer) = await asyncio.open_connection(args.host, args.port)
+    (_, stats) = await request(reader, writer, "/stats")
+    writer.close()
+    print("service:   ", json.dumps(json.loads(stats), indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for the astrolog chart service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--locations", type=int, default=100, help="distinct longitudes/latitudes to draw from")
+    parser.add_argument("--instants", type=int, default=24, help="distinct instants to draw from")
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
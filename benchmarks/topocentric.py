@@ -0,0 +1,64 @@
+"""Speed and accuracy of the many-locations-at-one-instant topocentric mode
+
+Computes the planets for random locations at random instants with astrolog.Topocentric and with one
+FLG_TOPOCTR Swiss Ephemeris call per location, reports the speedup and fails when the largest deviation
+exceeds astrolog.topocentric.TOLERANCE.
+
+    python benchmarks/topocentric.py --locations 1000 --instants 5 --ephe-path /path/to/ephe
+"""
+import argparse
+from datetime import datetime, timedelta
+import random
+import sys
+import time
+
+import swisseph as swe
+
+from astrolog import GeoLocation, Planet, Topocentric
+from astrolog.topocentric import TOLERANCE
+
+BODIES = [Planet.Sun, Planet.Moon, Planet.Mercury, Planet.Venus, Planet.Mars, Planet.Jupiter,
+          Planet.Saturn, Planet.Uranus, Planet.Neptune, Planet.Pluto]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the astrolog topocentric batch mode")
+    parser.add_argument("--locations", type=int, default=200)
+    parser.add_argument("--instants", type=int, default=5)
+    parser.add_argument("--ephe-path", default=None, help="directory with Swiss Ephemeris files")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.ephe_path:
+        swe.set_ephe_path(args.ephe_path)
+
+    rng = random.Random(args.seed)
+    (batch_time, single_time, worst) = (0.0, 0.0, 0.0)
+    for _ in range(args.instants):
+        when = datetime(1950, 1, 1) + timedelta(minutes=rng.randrange(100 * 365 * 24 * 60))
+        locations = [GeoLocation(rng.uniform(-180.0, 180.0), rng.uniform(-66.0, 66.0)) for _ in range(args.locations)]
+
+        started = time.perf_counter()
+        batch = Topocentric(when, locations)
+        for body in BODIES:
+            batch.swe_ecl_arrays(body)
+        batch_time += time.perf_counter() - started
+
+        started = time.perf_counter()
+        for location in locations:
+            swe.set_topo(location.longitude.degrees, location.latitude.degrees)
+            for body in BODIES:
+                body.swe_ecl_coord(batch.jd)
+        single_time += time.perf_counter() - started
+
+        errors = batch.validate(BODIES, tolerance=float("inf"))
+        worst = max(worst, max(errors.values()))
+
+    print(f"per-location calls: {single_time:.3f} s")
+    print(f"topocentric batch:  {batch_time:.3f} s ({single_time / batch_time:.2f}x)")
+    print(f"max error:          {worst:.3f}\" (tolerance {TOLERANCE}\")")
+    if worst > TOLERANCE:
+        sys.exit("topocentric batch exceeds the stated tolerance")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,21 @@
 from .primitives import GeoLocation, Angle, AngularSpeed, Au, AuSpeed
 from .coords import HorCoord, EclCoord, EquatorCoord, BaryCoord, HelioCoord, EclSpeed, EquatorSpeed, BarySpeed, HelioSpeed
 from .zodiac import Zodiac, ZodiacConstell
+from .precision import Precision, set_precision
 from .natal import NatalObject, Natal
 from .celestials import Celestial, Planet, ApsisNode, ApoApsis, PeriApsis, AscNode, DscNode, SecondFocus, FixedCelestial
+from .harmonics import Harmonics, AspectPatterns
+from .stations import StationCalendar
+from .topocentric import Topocentric
+from .stars import StarIndex
+from .midpoints import MidpointTree
+from .asteroids import AsteroidRegistry, AsteroidPositions
 
 __all__ = [GeoLocation, Angle, AngularSpeed,
            HorCoord, EclCoord, EquatorCoord, BaryCoord, HelioCoord, EclSpeed, EquatorSpeed, BarySpeed, HelioSpeed,
            Zodiac, ZodiacConstell,
+           Precision, set_precision,
            Natal, NatalObject,
-           Celestial, Planet, SecondFocus, ApsisNode, ApoApsis, PeriApsis, AscNode, DscNode, FixedCelestial]
\ No newline at end of file
+           Celestial, Planet, SecondFocus, ApsisNode, ApoApsis, PeriApsis, AscNode, DscNode, FixedCelestial,
+           Harmonics, AspectPatterns, StationCalendar, Topocentric, StarIndex,
+           MidpointTree, AsteroidRegistry, AsteroidPositions]
\ No newline at end of file
@@ -0,0 +1,187 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import math
+import os
+import re
+from types import NoneType
+
+import swisseph as swe
+
+from .celestials import Celestial, Planet
+from .precision import Precision
+
+
+J2000 = 2451545.0
+
+
+def ephemeris_file(number: int, jd: float = J2000) -> str:
+    """Swiss Ephemeris file holding the numbered asteroid at the julian day, relative to the ephemeris path
+
+    Ceres, Pallas, Juno and Vesta come with the main asteroid files covering 600 years each (seas_18.se1 for
+    1800..2399); the other asteroids have one file each, usually the short one (se00433s.se1, s136199s.se1),
+    which Swiss Ephemeris opens when the long file without the `s` suffix is not installed.
+    """
+    if number <= 4:
+        (year, _, _, _) = swe.revjul(jd)
+        century = math.floor(year / 100)
+        century -= century % 6
+        return f"seas{'m' if century < 0 else '_'}{abs(century):02d}.se1"
+    if number < 100000:
+        return f"ast{number // 1000}/se{number:05d}s.se1"
+    return f"ast{number // 1000}/s{number:06d}s.se1"
+
+
+class AsteroidRegistry:
+    """Numbered minor planets known by name"""
+
+    LINE = re.compile(r"^\s*\(?(\d+)\)?[\s,;]+(.+?)\s*$")
+
+    def __init__(self, asteroids: dict[str, int] | NoneType = None):
+        self.__numbers = {}
+        self.__names = {}
+        for (name, number) in (asteroids or {}).items():
+            self.add(name, number)
+
+    @classmethod
+    def from_celestials(cls):
+        """Registry of the asteroids known to `Celestial.NAMES`"""
+        return cls({name.capitalize(): code - swe.AST_OFFSET for (name, code) in Celestial.NAMES.items() if code > swe.AST_OFFSET})
+
+    @classmethod
+    def from_lines(cls, lines):
+        """Registry from a name/number table: one `number name` per line (seasnam.txt, CSV or whitespace separated)"""
+        registry = cls()
+        for line in lines:
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            match = cls.LINE.match(line)
+            if match is None:
+                raise RuntimeError(f"malformed asteroid table line: {line.strip()}")
+            registry.add(match.group(2), int(match.group(1)))
+        return registry
+
+    @classmethod
+    def from_file(cls, path: str):
+        with open(path, encoding="utf-8") as fp:
+            return cls.from_lines(fp)
+
+    def add(self, name: str, number: int):
+        self.__numbers[name.upper()] = number
+        self.__names[number] = name
+
+    def number(self, name: str | int) -> int:
+        if type(name) is int:
+            return name
+        number = self.__numbers.get(name.upper())
+        if number is None:
+            raise Exception(f"Unknown asteroid {name}")
+        return number
+
+    def name(self, number: int) -> str:
+        return self.__names.get(number, str(number))
+
+    def planet(self, name: str | int) -> Planet:
+        number = self.number(name)
+        return Planet(self.name(number), swe.AST_OFFSET + number)
+
+    def __contains__(self, name: str | int) -> bool:
+        return name in self.__names if type(name) is int else name.upper() in self.__numbers
+
+    def __len__(self) -> int:
+        return len(self.__names)
+
+    def __iter__(self):
+        return iter(self.__names.items())
+
+
+class AsteroidPositions:
+    """Geocentric ecliptic positions of many asteroids as arrays over the same julian days"""
+
+    def __init__(self, jds: array):
+        self.jds = jds
+        # keyed by asteroid number, or by the name for names unknown to the registry
+        self.longitudes = {}
+        self.latitudes = {}
+        self.distances = {}
+        self.longitude_speeds = {}
+        self.errors = {}
+
+    def numbers(self) -> [int]:
+        return list(self.longitudes.keys())
+
+    def json(self, number: int) -> dict:
+        return {
+            'long': list(self.longitudes[number]),
+            'lat': list(self.latitudes[number]),
+            'dist': list(self.distances[number]),
+            'long_spd': list(self.longitude_speeds[number]),
+        }
+
+
+def _init_worker(ephe_path: str | NoneType):
+    if ephe_path:
+        swe.set_ephe_path(ephe_path)
+
+
+def _compute_chunk(numbers: [int], jds: array, iflag: int) -> list:
+    results = []
+    for number in numbers:
+        (lngs, lats, dists, speeds) = (array('d'), array('d'), array('d'), array('d'))
+        try:
+            for jd in jds:
+                (ecl, _) = swe.calc_ut(jd, swe.AST_OFFSET + number, iflag)
+                lngs.append(ecl[0])
+                lats.append(ecl[1])
+                dists.append(ecl[2])
+                speeds.append(ecl[3])
+        except swe.Error as e:
+            results.append((number, None, str(e)))
+            continue
+        results.append((number, (lngs, lats, dists, speeds), None))
+    return results
+
+
+def compute(asteroids: [str | int], times: [datetime | float], *, registry: AsteroidRegistry | NoneType = None,
+            processes: int | NoneType = None, chunks_per_process: int = 4, ephe_path: str | NoneType = None,
+            precision: Precision | NoneType = None) -> AsteroidPositions:
+    """Positions of many asteroids at many times
+
+    Swiss Ephemeris keeps every asteroid in its own file, so the work is ordered by ephemeris file and each
+    worker computes all times of one asteroid before moving to the next, opening each file only once.
+    A missing or broken file, like a name unknown to the registry, is reported in `AsteroidPositions.errors`
+    instead of aborting the batch.
+    The Moshier ephemeris does not cover the asteroids, so the precision policy must use the ephemeris files.
+    """
+    if registry is None:
+        registry = AsteroidRegistry.from_celestials()
+    jds = array('d', [
+        swe.julday(tm.year, tm.month, tm.day, tm.hour + tm.minute / 60.) if isinstance(tm, datetime) else tm for tm in times
+    ])
+    result = AsteroidPositions(jds)
+    numbers = set()
+    for asteroid in asteroids:
+        try:
+            numbers.add(registry.number(asteroid))
+        except Exception as e:
+            result.errors[asteroid] = str(e)
+    first_jd = jds[0] if jds else J2000
+    numbers = sorted(numbers, key=lambda n: (ephemeris_file(n, first_jd), n))
+    iflag = Precision.swe_flags(precision) | swe.FLG_SPEED
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(numbers) < 2:
+        _init_worker(ephe_path)
+        computed = _compute_chunk(numbers, jds, iflag)
+    else:
+        # contiguous chunks keep neighbouring files (same ast directory) in the same worker
+        size = max(1, -(-len(numbers) // (processes * chunks_per_process)))
+        chunks = [numbers[k:k + size] for k in range(0, len(numbers), size)]
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(ephe_path,)) as pool:
+            futures = [pool.submit(_compute_chunk, chunk, jds, iflag) for chunk in chunks]
+            computed = [item for future in futures for item in future.result()]
+    for (number, arrays, error) in computed:
+        if error is not None:
+            result.errors[number] = error
+            continue
+        (result.longitudes[number], result.latitudes[number], result.distances[number], result.longitude_speeds[number]) = arrays
+    return result
@@ -5,8 +5,7 @@ from types import NoneType
 import swisseph as swe
 
 from . import GeoLocation, EclCoord, EquatorCoord, HorCoord, BaryCoord, HelioCoord, EclSpeed, EquatorSpeed, BarySpeed, HelioSpeed
-
-# TODO: Consider using SEFLG_TRUEPOS everywhere (since focal points and apsides use it anyway)
+from .precision import Precision
 
 class Celestial(ABC):
     """Abstract class for celestial objects whose location can be computed"""
@@ -32,26 +31,28 @@ class Celestial(ABC):
     def __init__(self):
         self.name = None
 
-    def ecl_coord(self, time: datetime, location: GeoLocation, *, speed: bool = False, mean: bool = False) -> EclCoord | EclSpeed:
+    def ecl_coord(self, time: datetime, location: GeoLocation, *, speed: bool = False, mean: bool = False,
+                  precision: Precision | NoneType = None) -> EclCoord | EclSpeed:
         swe.set_topo(location.longitude.degrees, location.latitude.degrees)
         jd = swe.julday(time.year, time.month, time.day, time.hour + time.minute / 60.)
-        return self.swe_ecl_coord(jd, speed=speed, mean=mean)
+        return self.swe_ecl_coord(jd, speed=speed, mean=mean, precision=precision)
 
-    def equator_coord(self, time: datetime, location: GeoLocation, *, speed: bool = False, mean: bool = False) -> EquatorCoord | EquatorSpeed:
+    def equator_coord(self, time: datetime, location: GeoLocation, *, speed: bool = False, mean: bool = False,
+                      precision: Precision | NoneType = None) -> EquatorCoord | EquatorSpeed:
         swe.set_topo(location.longitude.degrees, location.latitude.degrees)
         jd = swe.julday(time.year, time.month, time.day, time.hour + time.minute / 60.)
-        return self.swe_equator_coord(jd, speed=speed, mean=mean)
+        return self.swe_equator_coord(jd, speed=speed, mean=mean, precision=precision)
 
-    def hor_coord(self, time: datetime, location: GeoLocation, *, mean: bool = False) -> HorCoord:
+    def hor_coord(self, time: datetime, location: GeoLocation, *, mean: bool = False, precision: Precision | NoneType = None) -> HorCoord:
         swe.set_topo(location.longitude.degrees, location.latitude.degrees)
         jd = swe.julday(time.year, time.month, time.day, time.hour + time.minute / 60.)
-        coord = self.swe_equator_coord(jd, mean=mean)
+        coord = self.swe_equator_coord(jd, mean=mean, precision=precision)
         geopos = (location.longitude.degrees, location.latitude.degrees, 0.0)
         pos = (coord.ra.degrees, coord.decl.degrees, 0.0)
         atpress = 0
         attemp = 0
         (azimuth, true_alt, app_alt) = swe.azalt(jd, swe.EQU2HOR, geopos, atpress, attemp, pos)
-        return HorCoord(azimuth, true_alt)
+        return HorCoord(azimuth, true_alt, coord.distance.au)
 
     def ecl_speed(self, time: datetime, location: GeoLocation, **kwargs) -> EclSpeed:
         return self.ecl_coord(time, location, speed=True, **kwargs)
@@ -59,31 +60,31 @@ class Celestial(ABC):
     def equator_speed(self, time: datetime, location: GeoLocation, **kwargs) -> EquatorSpeed:
         return self.equator_coord(time, location, speed=True, **kwargs)
 
-    def transits(self, time: datetime, location: GeoLocation):
+    def transits(self, time: datetime, location: GeoLocation, *, precision: Precision | NoneType = None):
         return {
-            'rise': self.rises(time, location),
-            'set': self.sets(time, location),
-            'mc': self.mc_trans(time, location),
-            'ic': self.ic_trans(time, location),
+            'rise': self.rises(time, location, precision=precision),
+            'set': self.sets(time, location, precision=precision),
+            'mc': self.mc_trans(time, location, precision=precision),
+            'ic': self.ic_trans(time, location, precision=precision),
         }
 
-    def rises(self, time: datetime, location: GeoLocation):
-        return self.__rise_trans(time, location, swe.CALC_RISE)
+    def rises(self, time: datetime, location: GeoLocation, *, precision: Precision | NoneType = None):
+        return self.__rise_trans(time, location, swe.CALC_RISE, precision)
 
-    def sets(self, time: datetime, location: GeoLocation):
-        return self.__rise_trans(time, location, swe.CALC_SET)
+    def sets(self, time: datetime, location: GeoLocation, *, precision: Precision | NoneType = None):
+        return self.__rise_trans(time, location, swe.CALC_SET, precision)
 
-    def mc_trans(self, time: datetime, location: GeoLocation):
-        return self.__rise_trans(time, location, swe.CALC_MTRANSIT)
+    def mc_trans(self, time: datetime, location: GeoLocation, *, precision: Precision | NoneType = None):
+        return self.__rise_trans(time, location, swe.CALC_MTRANSIT, precision)
 
-    def ic_trans(self, time: datetime, location: GeoLocation):
-        return self.__rise_trans(time, location, swe.CALC_ITRANSIT)
+    def ic_trans(self, time: datetime, location: GeoLocation, *, precision: Precision | NoneType = None):
+        return self.__rise_trans(time, location, swe.CALC_ITRANSIT, precision)
 
-    def __rise_trans(self, when: datetime, location: GeoLocation, rsmi: int):
+    def __rise_trans(self, when: datetime, location: GeoLocation, rsmi: int, precision: Precision | NoneType = None):
         if self.is_focal_point():
             return None
         tjdut = swe.julday(when.year, when.month, when.day, 0.)
-        flags = swe.FLG_SWIEPH | swe.FLG_TOPOCTR
+        flags = Precision.swe_flags(precision) | swe.FLG_TOPOCTR
         rsmi |= swe.BIT_DISC_CENTER | swe.BIT_FIXED_DISC_SIZE | swe.BIT_NO_REFRACTION | swe.BIT_ASTRO_TWILIGHT
         lon = location.longitude.degrees
         lat = location.latitude.degrees
@@ -123,11 +124,11 @@ class Celestial(ABC):
         pass
 
     @abstractmethod
-    def swe_ecl_coord(self, jd, *, speed: bool = False, mean: bool = False) -> EclCoord | EclSpeed:
+    def swe_ecl_coord(self, jd, *, speed: bool = False, mean: bool = False, precision: Precision | NoneType = None) -> EclCoord | EclSpeed:
         pass
 
     @abstractmethod
-    def swe_equator_coord(self, jd, speed: bool = False, mean: bool = False) -> EquatorCoord | EclSpeed:
+    def swe_equator_coord(self, jd, speed: bool = False, mean: bool = False, precision: Precision | NoneType = None) -> EquatorCoord | EclSpeed:
         pass
 
 
@@ -136,7 +137,7 @@ class Planet(Celestial):
 
     def __init__(self, name: str, swe_code: int | NoneType = None):
         self.name = name
-        self.__swe_code = swe_code or Celestial.swe_id_by_name(name)
+        self.__swe_code = swe_code if swe_code is not None else Celestial.swe_id_by_name(name)
 
     def is_fixed(self) -> bool:
         return False
@@ -144,13 +145,13 @@ class Planet(Celestial):
     def is_focal_point(self) -> bool:
         return False
 
-    def bary_coord(self, time: datetime, *, speed: bool = False, mean: bool = False) -> BaryCoord | BarySpeed:
+    def bary_coord(self, time: datetime, *, speed: bool = False, mean: bool = False, precision: Precision | NoneType = None) -> BaryCoord | BarySpeed:
         jd = swe.julday(time.year, time.month, time.day, time.hour + time.minute / 60.)
-        return self.swe_bary_coord(jd, speed=speed, mean=mean)
+        return self.swe_bary_coord(jd, speed=speed, mean=mean, precision=precision)
 
-    def helio_coord(self, time: datetime, *, speed: bool = False, mean: bool = False) -> HelioCoord | HelioSpeed:
+    def helio_coord(self, time: datetime, *, speed: bool = False, mean: bool = False, precision: Precision | NoneType = None) -> HelioCoord | HelioSpeed:
         jd = swe.julday(time.year, time.month, time.day, time.hour + time.minute / 60.)
-        return self.swe_helio_coord(jd, speed=speed, mean=mean)
+        return self.swe_helio_coord(jd, speed=speed, mean=mean, precision=precision)
 
     def bary_speed(self, time: datetime, **kwargs) -> BarySpeed:
         return self.bary_coord(time, speed=True, **kwargs)
@@ -161,39 +162,39 @@ class Planet(Celestial):
     def swe_id(self):
         return self.__swe_code
 
-    def swe_calc(self, jd, iflag, *, speed: bool = False, mean: bool = False):
+    def swe_calc(self, jd, iflag, *, speed: bool = False, mean: bool = False, precision: Precision | NoneType = None):
         if mean is not False:
             raise RuntimeError("mean position flag has no meaning for the planets")
-        iflag |= swe.FLG_SWIEPH
+        iflag |= Precision.swe_flags(precision)
         if speed:
             iflag |= swe.FLG_SPEED
         return swe.calc_ut(jd, self.__swe_code, iflag)
 
-    def swe_ecl_coord(self, jd, *, speed: bool = False, mean: bool = False) -> EclCoord | EclSpeed:
-        (ecl, _) = self.swe_calc(jd, swe.FLG_TOPOCTR, speed=speed, mean=mean)
+    def swe_ecl_coord(self, jd, *, speed: bool = False, mean: bool = False, precision: Precision | NoneType = None) -> EclCoord | EclSpeed:
+        (ecl, _) = self.swe_calc(jd, swe.FLG_TOPOCTR, speed=speed, mean=mean, precision=precision)
         if speed:
-            return EclSpeed(ecl[0], ecl[1], ecl[2], ecl[3], ecl[4])
+            return EclSpeed(ecl[0], ecl[1], ecl[2], ecl[3], ecl[4], ecl[5])
         else:
             return EclCoord(ecl[0], ecl[1], ecl[2])
 
-    def swe_equator_coord(self, jd, *, speed: bool = False, mean: bool = False) -> EquatorCoord | EquatorSpeed:
-        (equator, _) = self.swe_calc(jd, swe.FLG_TOPOCTR | swe.FLG_EQUATORIAL, speed=speed, mean=mean)
+    def swe_equator_coord(self, jd, *, speed: bool = False, mean: bool = False, precision: Precision | NoneType = None) -> EquatorCoord | EquatorSpeed:
+        (equator, _) = self.swe_calc(jd, swe.FLG_TOPOCTR | swe.FLG_EQUATORIAL, speed=speed, mean=mean, precision=precision)
         if speed:
-            return EquatorSpeed(equator[0], equator[1], equator[2], equator[3], equator[4])
+            return EquatorSpeed(equator[0], equator[1], equator[2], equator[3], equator[4], equator[5])
         else:
             return EquatorCoord(equator[0], equator[1], equator[2])
 
-    def swe_bary_coord(self, jd, speed: bool = False, mean: bool = False) -> BaryCoord | BarySpeed:
-        (ecl, _) = self.swe_calc(jd, swe.FLG_BARYCTR, speed=speed, mean=mean)
+    def swe_bary_coord(self, jd, speed: bool = False, mean: bool = False, precision: Precision | NoneType = None) -> BaryCoord | BarySpeed:
+        (ecl, _) = self.swe_calc(jd, swe.FLG_BARYCTR, speed=speed, mean=mean, precision=precision)
         if speed:
-            return BarySpeed(ecl[0], ecl[1], ecl[2], ecl[3], ecl[4])
+            return BarySpeed(ecl[0], ecl[1], ecl[2], ecl[3], ecl[4], ecl[5])
         else:
             return BaryCoord(ecl[0], ecl[1], ecl[2])
 
-    def swe_helio_coord(self, jd, speed: bool = False, mean: bool = False) -> HelioCoord | HelioSpeed:
-        (ecl, _) = self.swe_calc(jd, swe.FLG_HELCTR, speed=speed, mean=mean)
+    def swe_helio_coord(self, jd, speed: bool = False, mean: bool = False, precision: Precision | NoneType = None) -> HelioCoord | HelioSpeed:
+        (ecl, _) = self.swe_calc(jd, swe.FLG_HELCTR, speed=speed, mean=mean, precision=precision)
         if speed:
-            return HelioSpeed(ecl[0], ecl[1], ecl[2], ecl[3], ecl[4])
+            return HelioSpeed(ecl[0], ecl[1], ecl[2], ecl[3], ecl[4], ecl[5])
         else:
             return HelioCoord(ecl[0], ecl[1], ecl[2])
 
@@ -203,13 +204,14 @@ class ApsisNode(Celestial):
 
     def __init__(self, name: str, swe_code: int | NoneType = None):
         self.name = name
-        self.__swe_code = swe_code or Celestial.swe_id_by_name(name)
+        self.__swe_code = swe_code if swe_code is not None else Celestial.swe_id_by_name(name)
 
-    def _swe_ecl_coord_nod_aps(self, jd, *, speed: bool = False, mean: bool = False, equatorial: bool = False, second_focus: bool = False):
+    def _swe_ecl_coord_nod_aps(self, jd, *, speed: bool = False, mean: bool = False, equatorial: bool = False, second_focus: bool = False,
+                               precision: Precision | NoneType = None):
         method = swe.NODBIT_MEAN if mean else swe.NODBIT_OSCU
         if second_focus:
             method |= swe.NODBIT_FOPOINT
-        iflag = swe.FLG_SWIEPH | swe.FLG_TOPOCTR
+        iflag = Precision.swe_flags(precision) | swe.FLG_TOPOCTR
         if speed:
             iflag |= swe.FLG_SPEED
         if equatorial:
@@ -229,15 +231,15 @@ class ApsisNode(Celestial):
 class SecondFocus(ApsisNode):
     """Second focal point of some planet orbit"""
 
-    def swe_ecl_coord(self, jd, *, speed: bool = False, mean: bool = False) -> EclCoord:
-        (_, _, _, ecl) = super()._swe_ecl_coord_nod_aps(jd, speed=speed, mean=mean, equatorial=False, second_focus=True)
+    def swe_ecl_coord(self, jd, *, speed: bool = False, mean: bool = False, precision: Precision | NoneType = None) -> EclCoord:
+        (_, _, _, ecl) = super()._swe_ecl_coord_nod_aps(jd, speed=speed, mean=mean, equatorial=False, second_focus=True, precision=precision)
         if speed:
             return EclSpeed(ecl[0], ecl[1], ecl[2], ecl[3], ecl[4], ecl[5])
         else:
             return EclCoord(ecl[0], ecl[1], ecl[2])
 
-    def swe_equator_coord(self, jd, *, speed: bool = False, mean: bool = False) -> EquatorCoord:
-        (_, _, _, equator) = super()._swe_ecl_coord_nod_aps(jd, speed=speed, mean=mean, equatorial=True, second_focus=True)
+    def swe_equator_coord(self, jd, *, speed: bool = False, mean: bool = False, precision: Precision | NoneType = None) -> EquatorCoord:
+        (_, _, _, equator) = super()._swe_ecl_coord_nod_aps(jd, speed=speed, mean=mean, equatorial=True, second_focus=True, precision=precision)
         if speed:
             return EquatorSpeed(equator[0], equator[1], equator[2], equator[3], equator[4], equator[5])
         else:
@@ -247,15 +249,15 @@ class SecondFocus(ApsisNode):
 class ApoApsis(ApsisNode):
     """Aphelion/apogee of some planet orbit"""
 
-    def swe_ecl_coord(self, jd, *, speed: bool = False, mean: bool = False) -> EclCoord:
-        (_, _, _, ecl) = super()._swe_ecl_coord_nod_aps(jd, speed=speed, mean=mean, equatorial=False)
+    def swe_ecl_coord(self, jd, *, speed: bool = False, mean: bool = False, precision: Precision | NoneType = None) -> EclCoord:
+        (_, _, _, ecl) = super()._swe_ecl_coord_nod_aps(jd, speed=speed, mean=mean, equatorial=False, precision=precision)
         if speed:
             return EclSpeed(ecl[0], ecl[1], ecl[2], ecl[3], ecl[4], ecl[5])
         else:
             return EclCoord(ecl[0], ecl[1], ecl[2])
 
-    def swe_equator_coord(self, jd, *, speed: bool = False, mean: bool = False) -> EquatorCoord:
-        (_, _, _, equator) = super()._swe_ecl_coord_nod_aps(jd, speed=speed, mean=mean, equatorial=True)
+    def swe_equator_coord(self, jd, *, speed: bool = False, mean: bool = False, precision: Precision | NoneType = None) -> EquatorCoord:
+        (_, _, _, equator) = super()._swe_ecl_coord_nod_aps(jd, speed=speed, mean=mean, equatorial=True, precision=precision)
         if speed:
             return EquatorSpeed(equator[0], equator[1], equator[2], equator[3], equator[4], equator[5])
         else:
@@ -265,15 +267,15 @@ class ApoApsis(ApsisNode):
 class PeriApsis(ApsisNode):
     """Perihelion/perigee of some planet orbit"""
 
-    def swe_ecl_coord(self, jd, *, speed: bool = False, mean: bool = False) -> EclCoord:
-        (_, _, ecl, _) = super()._swe_ecl_coord_nod_aps(jd, speed=speed, mean=mean, equatorial=False)
+    def swe_ecl_coord(self, jd, *, speed: bool = False, mean: bool = False, precision: Precision | NoneType = None) -> EclCoord:
+        (_, _, ecl, _) = super()._swe_ecl_coord_nod_aps(jd, speed=speed, mean=mean, equatorial=False, precision=precision)
         if speed:
             return EclSpeed(ecl[0], ecl[1], ecl[2], ecl[3], ecl[4], ecl[5])
         else:
             return EclCoord(ecl[0], ecl[1], ecl[2])
 
-    def swe_equator_coord(self, jd, *, speed: bool = False, mean: bool = False) -> EquatorCoord:
-        (_, _, equator, _) = super()._swe_ecl_coord_nod_aps(jd, speed=speed, mean=mean, equatorial=True)
+    def swe_equator_coord(self, jd, *, speed: bool = False, mean: bool = False, precision: Precision | NoneType = None) -> EquatorCoord:
+        (_, _, equator, _) = super()._swe_ecl_coord_nod_aps(jd, speed=speed, mean=mean, equatorial=True, precision=precision)
         if speed:
             return EquatorSpeed(equator[0], equator[1], equator[2], equator[3], equator[4], equator[5])
         else:
@@ -283,15 +285,15 @@ class PeriApsis(ApsisNode):
 class AscNode(ApsisNode):
     """Ascending node of some planet orbit"""
 
-    def swe_ecl_coord(self, jd, *, speed: bool = False, mean: bool = False) -> EclCoord:
-        (ecl, _, _, _) = super()._swe_ecl_coord_nod_aps(jd, speed=speed, mean=mean, equatorial=False)
+    def swe_ecl_coord(self, jd, *, speed: bool = False, mean: bool = False, precision: Precision | NoneType = None) -> EclCoord:
+        (ecl, _, _, _) = super()._swe_ecl_coord_nod_aps(jd, speed=speed, mean=mean, equatorial=False, precision=precision)
         if speed:
             return EclSpeed(ecl[0], ecl[1], ecl[2], ecl[3], ecl[4], ecl[5])
         else:
             return EclCoord(ecl[0], ecl[1], ecl[2])
 
-    def swe_equator_coord(self, jd, *, speed: bool = False, mean: bool = False) -> EquatorCoord:
-        (equator, _, _, _) = super()._swe_ecl_coord_nod_aps(jd, speed=speed, mean=mean, equatorial=True)
+    def swe_equator_coord(self, jd, *, speed: bool = False, mean: bool = False, precision: Precision | NoneType = None) -> EquatorCoord:
+        (equator, _, _, _) = super()._swe_ecl_coord_nod_aps(jd, speed=speed, mean=mean, equatorial=True, precision=precision)
         if speed:
             return EquatorSpeed(equator[0], equator[1], equator[2], equator[3], equator[4], equator[5])
         else:
@@ -301,15 +303,15 @@ class AscNode(ApsisNode):
 class DscNode(ApsisNode):
     """Descending node of some planet orbit"""
 
-    def swe_ecl_coord(self, jd, *, speed: bool = False, mean: bool = False) -> EclCoord:
-        (_, ecl, _, _) = super()._swe_ecl_coord_nod_aps(jd, speed=speed, mean=mean, equatorial=False)
+    def swe_ecl_coord(self, jd, *, speed: bool = False, mean: bool = False, precision: Precision | NoneType = None) -> EclCoord:
+        (_, ecl, _, _) = super()._swe_ecl_coord_nod_aps(jd, speed=speed, mean=mean, equatorial=False, precision=precision)
         if speed:
             return EclSpeed(ecl[0], ecl[1], ecl[2], ecl[3], ecl[4], ecl[5])
         else:
             return EclCoord(ecl[0], ecl[1], ecl[2])
 
-    def swe_equator_coord(self, jd, *, speed: bool = False, mean: bool = False) -> EquatorCoord:
-        (_, equator, _, _) = super()._swe_ecl_coord_nod_aps(jd, speed=speed, mean=mean, equatorial=True)
+    def swe_equator_coord(self, jd, *, speed: bool = False, mean: bool = False, precision: Precision | NoneType = None) -> EquatorCoord:
+        (_, equator, _, _) = super()._swe_ecl_coord_nod_aps(jd, speed=speed, mean=mean, equatorial=True, precision=precision)
         if speed:
             return EquatorSpeed(equator[0], equator[1], equator[2], equator[3], equator[4], equator[5])
         else:
@@ -332,10 +334,10 @@ class FixedCelestial(Celestial):
     def is_focal_point(self) -> bool:
         return False
 
-    def swe_ecl_coord(self, jd, *, speed: bool = False, mean: bool = False) -> EclCoord:
+    def swe_ecl_coord(self, jd, *, speed: bool = False, mean: bool = False, precision: Precision | NoneType = None) -> EclCoord:
         if mean is not False:
             raise RuntimeError("mean position flag has no meaning for fixed objects")
-        iflag = swe.FLG_SWIEPH | swe.FLG_TOPOCTR
+        iflag = Precision.swe_flags(precision) | swe.FLG_TOPOCTR
         if speed:
             iflag |= swe.FLG_SPEED
         (ecl, _, _) = swe.fixstar_ut(self.__swe_code, jd, iflag)
@@ -344,10 +346,10 @@ class FixedCelestial(Celestial):
         else:
             return EclCoord(ecl[0], ecl[1], ecl[2])
 
-    def swe_equator_coord(self, jd, *, speed: bool = False, mean: bool = False) -> EquatorCoord:
+    def swe_equator_coord(self, jd, *, speed: bool = False, mean: bool = False, precision: Precision | NoneType = None) -> EquatorCoord:
         if mean is not False:
             raise RuntimeError("mean position flag has no meaning for fixed objects")
-        iflag = swe.FLG_SWIEPH | swe.FLG_TOPOCTR | swe.FLG_EQUATORIAL
+        iflag = Precision.swe_flags(precision) | swe.FLG_TOPOCTR | swe.FLG_EQUATORIAL
         if speed:
             iflag |= swe.FLG_SPEED
         (equator, _, _) = swe.fixstar_ut(self.__swe_code, jd, iflag)
@@ -0,0 +1,192 @@
+from array import array
+from itertools import combinations
+from types import NoneType
+
+from .natal import Natal, chart_longitudes
+
+
+def _separation(lng1: float, lng2: float) -> float:
+    return abs((lng1 - lng2 + 180.0) % 360.0 - 180.0)
+
+
+class Harmonics:
+    """Harmonic spectrum of a chart
+
+    The separation of every pair of bodies is computed once and reused for every harmonic; the
+    scores are plain Python loops over the pairs, stored in `array('d')` rows indexed like `pairs`.
+    """
+
+    def __init__(self, longitudes: dict | list | Natal, harmonics: int = 13, orb: float = 12.0):
+        (self.names, self.longitudes) = chart_longitudes(longitudes)
+        self.harmonics = harmonics
+        self.orb = orb
+        self.pairs = list(combinations(range(len(self.longitudes)), 2))
+        lngs = self.longitudes
+        self.separations = array('d', [_separation(lngs[i], lngs[j]) for (i, j) in self.pairs])
+        self.__strengths = None
+
+    @classmethod
+    def from_natal(cls, natal: Natal, **kwargs):
+        return cls(natal, **kwargs)
+
+    def positions(self, harmonic: int) -> array:
+        """Longitudes of the bodies in the given harmonic chart"""
+        return array('d', [(lng * harmonic) % 360.0 for lng in self.longitudes])
+
+    def strengths(self) -> list[array]:
+        """Strength scores (0..1) of every pair of bodies for harmonics 1..N
+
+        A pair is in aspect in harmonic H when the bodies are conjunct in the H-th harmonic chart;
+        the score falls linearly from 1 for an exact conjunction to 0 at the orb.
+        """
+        if self.__strengths is None:
+            orb = self.orb
+            self.__strengths = [
+                array('d', [max(0.0, 1.0 - _separation((sep * harmonic) % 360.0, 0.0) / orb) for sep in self.separations])
+                for harmonic in range(1, self.harmonics + 1)
+            ]
+        return self.__strengths
+
+    def spectrum(self) -> array:
+        """Total strength of every harmonic 1..N summed over all pairs"""
+        return array('d', [sum(row) for row in self.strengths()])
+
+    def pair_strengths(self, harmonic: int, threshold: float = 0.0):
+        row = self.strengths()[harmonic - 1]
+        for (k, (i, j)) in enumerate(self.pairs):
+            if row[k] > threshold:
+                yield {"first": self.names[i], "second": self.names[j], "harmonic": harmonic, "strength": row[k]}
+
+    def aspect_matrix(self, orbs: dict | NoneType = None) -> dict:
+        """Adjacency sets of the bodies for every aspect of `AspectPatterns.ASPECTS`
+
+        The given orbs override the defaults of `AspectPatterns.ORBS` aspect by aspect.
+        """
+        orbs = {**AspectPatterns.ORBS, **(orbs or {})}
+        matrix = {name: [set() for _ in self.longitudes] for name in AspectPatterns.ASPECTS}
+        for (k, (i, j)) in enumerate(self.pairs):
+            sep = self.separations[k]
+            for (name, angle) in AspectPatterns.ASPECTS.items():
+                if abs(sep - angle) <= orbs[name]:
+                    matrix[name][i].add(j)
+                    matrix[name][j].add(i)
+        return matrix
+
+    def patterns(self, orbs: dict | NoneType = None):
+        return AspectPatterns(self.aspect_matrix(orbs), self.names).find()
+
+
+class AspectPatterns:
+    """Multi-body aspect patterns found by clique search over the aspect matrix"""
+
+    ASPECTS = {
+        "conjunction": 0.0,
+        "sextile": 60.0,
+        "square": 90.0,
+        "trine": 120.0,
+        "quincunx": 150.0,
+        "opposition": 180.0,
+    }
+
+    ORBS = {
+        "conjunction": 8.0,
+        "sextile": 4.0,
+        "square": 7.0,
+        "trine": 7.0,
+        "quincunx": 3.0,
+        "opposition": 8.0,
+    }
+
+    def __init__(self, matrix: dict, names: list):
+        self.matrix = matrix
+        self.names = names
+
+    def find(self):
+        yield from self.stelliums()
+        yield from self.grand_trines()
+        yield from self.kites()
+        yield from self.t_squares()
+        yield from self.grand_crosses()
+        yield from self.yods()
+
+    def _pattern(self, pattern: str, bodies) -> dict:
+        return {"pattern": pattern, "bodies": tuple(self.names[i] for i in bodies)}
+
+    def _triangles(self, adj: list):
+        for i in range(len(adj)):
+            for j in adj[i]:
+                if j <= i:
+                    continue
+                for k in adj[i] & adj[j]:
+                    if k > j:
+                        yield i, j, k
+
+    def _cliques(self, adj: list, r: set, p: set, x: set):
+        # Bron-Kerbosch with pivoting
+        if not p and not x:
+            yield r
+            return
+        pivot = max(p | x, key=lambda v: len(adj[v] & p))
+        for v in list(p - adj[pivot]):
+            yield from self._cliques(adj, r | {v}, p & adj[v], x & adj[v])
+            p = p - {v}
+            x = x | {v}
+
+    def stelliums(self, size: int = 3):
+        adj = self.matrix["conjunction"]
+        for clique in self._cliques(adj, set(), set(range(len(adj))), set()):
+            if len(clique) >= size:
+                yield self._pattern("stellium", sorted(clique))
+
+    def grand_trines(self):
+        for triangle in self._triangles(self.matrix["trine"]):
+            yield self._pattern("grand trine", triangle)
+
+    def kites(self):
+        opposition = self.matrix["opposition"]
+        sextile = self.matrix["sextile"]
+        for triangle in self._triangles(self.matrix["trine"]):
+            for apex in triangle:
+                (b, c) = (v for v in triangle if v != apex)
+                for d in opposition[apex] & sextile[b] & sextile[c]:
+                    yield self._pattern("kite", (apex, b, c, d))
+
+    def t_squares(self):
+        square = self.matrix["square"]
+        for (a, opposed) in enumerate(self.matrix["opposition"]):
+            for b in opposed:
+                if b <= a:
+                    continue
+                for apex in square[a] & square[b]:
+                    yield self._pattern("t-square", (a, b, apex))
+
+    def grand_crosses(self):
+        opposition = self.matrix["opposition"]
+        square = self.matrix["square"]
+        for (a, opposed) in enumerate(opposition):
+            for c in opposed:
+                if c <= a:
+                    continue
+                for b in square[a] & square[c]:
+                    if b <= a:
+                        continue
+                    for d in opposition[b] & square[a] & square[c]:
+                        if d > b:
+                            yield self._pattern("grand cross", (a, b, c, d))
+
+    def yods(self):
+        quincunx = self.matrix["quincunx"]
+        for (a, sextiles) in enumerate(self.matrix["sextile"]):
+            for b in sextiles:
+                if b <= a:
+                    continue
+                for apex in quincunx[a] & quincunx[b]:
+                    yield self._pattern("yod", (a, b, apex))
+
+
+def scan(charts, orbs: dict | NoneType = None):
+    """Detect aspect patterns over a store of charts given as longitude lists or dicts"""
+    for (index, longitudes) in enumerate(charts):
+        found = list(Harmonics(longitudes, harmonics=1).patterns(orbs))
+        if found:
+            yield index, found
@@ -0,0 +1,159 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from itertools import combinations
+from types import NoneType
+
+import swisseph as swe
+
+from .celestials import Celestial
+from .natal import Natal, chart_longitudes
+from .precision import Precision
+from .primitives import GeoLocation
+
+
+def midpoint(lng1: float, lng2: float) -> float:
+    """Nearer midpoint of two longitudes"""
+    return (lng1 + ((lng2 - lng1 + 180.0) % 360.0 - 180.0) / 2.0) % 360.0
+
+
+class MidpointTree:
+    """Midpoints of all pairs of bodies sorted on a dial for Ebertin/Uranian midpoint analysis
+
+    The dial is 360°, 90° or 45°; positions are reduced modulo the dial so that both midpoints of a pair
+    and all hard aspects to them coincide. Looking up a point is a bisection on the circular sorted index.
+    """
+
+    def __init__(self, longitudes: dict | list | Natal, dial: float = 90.0):
+        (self.names, self.longitudes) = chart_longitudes(longitudes)
+        self.dial = dial
+        lngs = self.longitudes
+        pairs = list(combinations(range(len(lngs)), 2))
+        midpoints = [midpoint(lngs[i], lngs[j]) for (i, j) in pairs]
+        order = sorted(range(len(pairs)), key=lambda k: midpoints[k] % dial)
+        self.pairs = [pairs[k] for k in order]
+        self.midpoints = array('d', [midpoints[k] for k in order])
+        self.positions = array('d', [midpoints[k] % dial for k in order])
+
+    @classmethod
+    def from_natal(cls, natal: Natal, **kwargs):
+        return cls(natal, **kwargs)
+
+    def __range(self, lo: float, hi: float):
+        return range(bisect_left(self.positions, lo), bisect_right(self.positions, hi))
+
+    def lookup(self, longitude: float, orb: float = 1.0) -> [(int, float)]:
+        """Indices of the midpoints within the orb of the longitude on the dial with their deviations"""
+        pos = longitude % self.dial
+        (lo, hi) = (pos - orb, pos + orb)
+        found = list(self.__range(max(lo, 0.0), min(hi, self.dial)))
+        if lo < 0.0:
+            found += self.__range(lo + self.dial, self.dial)
+        if hi > self.dial:
+            found += self.__range(0.0, hi - self.dial)
+        result = []
+        for k in set(found):
+            dev = (self.positions[k] - pos + self.dial / 2.0) % self.dial - self.dial / 2.0
+            result.append((k, dev))
+        result.sort(key=lambda match: abs(match[1]))
+        return result
+
+    def __hit(self, k: int, dev: float) -> dict:
+        (i, j) = self.pairs[k]
+        return {"first": self.names[i], "second": self.names[j], "midpoint": self.midpoints[k], "orb": dev}
+
+    def activations(self, orb: float = 1.0):
+        """Bodies of the chart that fall on midpoints of other pairs"""
+        for (idx, lng) in enumerate(self.longitudes):
+            for (k, dev) in self.lookup(lng, orb):
+                if idx in self.pairs[k]:
+                    continue
+                hit = self.__hit(k, dev)
+                hit["body"] = self.names[idx]
+                yield hit
+
+    def transits(self, longitudes: dict, orb: float = 1.0):
+        """Outside positions (e.g. transits) that fall on midpoints of the chart"""
+        for (name, lng) in longitudes.items():
+            for (k, dev) in self.lookup(lng, orb):
+                hit = self.__hit(k, dev)
+                hit["body"] = name
+                yield hit
+
+    def __crossings(self, lng1: float, lng2: float):
+        """Midpoints passed moving on the dial from lng1 to lng2 with the fraction of the move at which each is passed"""
+        half = self.dial / 2.0
+        delta = (lng2 - lng1 + half) % self.dial - half
+        for (k, _) in self.lookup(lng1 + delta / 2.0, abs(delta) / 2.0):
+            dev1 = (self.positions[k] - lng1 + half) % self.dial - half
+            dev2 = (self.positions[k] - lng2 + half) % self.dial - half
+            if (dev1 < 0.0) != (dev2 < 0.0):
+                yield k, dev1 / (dev1 - dev2)
+
+    def scan(self, celestials: [Celestial], start: datetime, end: datetime, step: timedelta, location: GeoLocation, *,
+             orb: float = 1.0, precision: Precision | NoneType = None):
+        """Contacts of the transiting celestials with the midpoints of the chart from start to end
+
+        Consecutive steps within the orb of the same midpoint are merged into one contact with `entry` and
+        `exit` times (first step inside and first step outside the orb, `None` if still inside at the end)
+        and the `exact` time, interpolated linearly where the deviation changes sign. When it does not
+        change sign (e.g. a station within the orb) `exact` is the step of the smallest deviation.
+        A body moving more than the orb in one step may pass a midpoint without any step inside the orb;
+        the contact is still reported, with the steps before and after the crossing as `entry` and `exit`.
+        Steps during which a body moves half the dial or more are ambiguous and raise an error.
+        """
+        swe.set_topo(location.longitude.degrees, location.latitude.degrees)
+        days = step / timedelta(days=1)
+        active = {}
+        last = {}
+        time = start
+        while time <= end:
+            jd = swe.julday(time.year, time.month, time.day, time.hour + time.minute / 60.)
+            current = {}
+            crossed = {}
+            for cel in celestials:
+                coord = cel.swe_ecl_coord(jd, speed=True, precision=precision)
+                if abs(coord.longitude_speed.deg_per_day * days) >= self.dial / 2.0:
+                    raise RuntimeError(f"{cel.name} moves half of the {self.dial}° dial or more in one step, use a shorter step")
+                lng = coord.longitude.degrees
+                for (k, dev) in self.lookup(lng, orb):
+                    current[(cel.name, k)] = dev
+                if cel.name in last:
+                    (last_time, last_lng) = last[cel.name]
+                    for (k, fraction) in self.__crossings(last_lng, lng):
+                        crossed[(cel.name, k)] = (last_time, last_time + (time - last_time) * fraction)
+                last[cel.name] = (time, lng)
+            for (key, (last_time, exact)) in crossed.items():
+                contact = active.get(key)
+                if contact is None:
+                    # passed between the steps without being within the orb before
+                    contact = active[key] = {"key": key, "entry": last_time, "crossed": False}
+                if not contact["crossed"]:
+                    contact["exact"] = exact
+                    contact["orb"] = 0.0
+                    contact["crossed"] = True
+            for key in list(active):
+                if key not in current:
+                    contact = active.pop(key)
+                    contact["exit"] = time
+                    yield self.__contact(contact)
+            for (key, dev) in current.items():
+                contact = active.get(key)
+                if contact is None:
+                    active[key] = {"key": key, "entry": time, "exact": time, "orb": dev, "crossed": False}
+                elif not contact["crossed"] and abs(dev) < abs(contact["orb"]):
+                    contact["exact"] = time
+                    contact["orb"] = dev
+            time += step
+        for contact in active.values():
+            contact["exit"] = None
+            yield self.__contact(contact)
+
+    def __contact(self, contact: dict) -> dict:
+        (name, k) = contact["key"]
+        hit = self.__hit(k, contact["orb"])
+        hit["body"] = name
+        hit["entry"] = contact["entry"]
+        hit["exact"] = contact["exact"]
+        hit["exit"] = contact["exit"]
+        return hit
@@ -1,22 +1,38 @@
+from array import array
 from datetime import datetime, time, timedelta
+import math
+from types import NoneType
+
 import swisseph as swe
 
 from .celestials import Celestial
+from .precision import Precision
 from .primitives import GeoLocation
-from .coords import HorCoord, EclCoord, EquatorCoord, EclSpeed
+from .coords import HorCoord, EclCoord, EquatorCoord, EclSpeed, EquatorSpeed
 from .zodiac import Zodiac, ZodiacConstell
 
 
+def _equator_to_hor(equator: EquatorCoord, armc: float, latitude: float) -> HorCoord:
+    # Same convention as swe.azalt: azimuth is measured from the south point westward
+    hour_angle = math.radians(armc - equator.ra.degrees)
+    decl = equator.decl.radians()
+    alt = math.asin(math.sin(latitude) * math.sin(decl) + math.cos(latitude) * math.cos(decl) * math.cos(hour_angle))
+    azimuth = math.atan2(math.sin(hour_angle), math.cos(hour_angle) * math.sin(latitude) - math.tan(decl) * math.cos(latitude))
+    return HorCoord(math.degrees(azimuth) % 360.0, math.degrees(alt), equator.distance.au)
+
+
 class NatalObject:
     """Natal object computable type"""
 
-    def __init__(self, obj: Celestial, birth: datetime, place: GeoLocation):
+    def __init__(self, obj: Celestial, birth: datetime, place: GeoLocation, precision: Precision | NoneType = None):
         self.name = obj.name
         self.obj = obj
         self.birth = birth
         self.place = place
+        self.precision = precision
         self.__ecl_coord = None
         self.__equator_coord = None
+        self.__hor_coord = None
         self.__transits = None
 
     def julday(self) -> float:
@@ -25,23 +41,30 @@ class NatalObject:
     def ecl_coord(self, *, speed: bool = False, mean: bool = False) -> EclCoord | EclSpeed:
         if self.__ecl_coord is None:
             swe.set_topo(self.place.longitude.degrees, self.place.latitude.degrees)
-            self.__ecl_coord = self.obj.swe_ecl_coord(self.julday(), speed=speed, mean=mean)
+            self.__ecl_coord = self.obj.swe_ecl_coord(self.julday(), speed=speed, mean=mean, precision=self.precision)
         return self.__ecl_coord
 
     def equator_coord(self, *, speed: bool = False, mean: bool = False) -> EquatorCoord | EquatorCoord:
         if self.__equator_coord is None:
             swe.set_topo(self.place.longitude.degrees, self.place.latitude.degrees)
-            self.__equator_coord = self.obj.swe_equator_coord(self.julday(), speed=speed, mean=mean)
+            self.__equator_coord = self.obj.swe_equator_coord(self.julday(), speed=speed, mean=mean, precision=self.precision)
         return self.__equator_coord
 
     def hor_coord(self) -> HorCoord:
-        coord = self.ecl_coord()
-        geopos = (self.place.longitude.degrees, self.place.latitude.degrees, 0.0)
-        pos = (coord.longitude.degrees, coord.latitude.degrees, 0.0)
-        atpress = 0
-        attemp = 0
-        (azimuth, true_alt, app_alt) = swe.azalt(self.julday(), swe.ECL2HOR, geopos, atpress, attemp, pos)
-        return HorCoord(azimuth, true_alt)
+        if self.__hor_coord is None:
+            coord = self.ecl_coord()
+            geopos = (self.place.longitude.degrees, self.place.latitude.degrees, 0.0)
+            pos = (coord.longitude.degrees, coord.latitude.degrees, 0.0)
+            atpress = 0
+            attemp = 0
+            (azimuth, true_alt, app_alt) = swe.azalt(self.julday(), swe.ECL2HOR, geopos, atpress, attemp, pos)
+            self.__hor_coord = HorCoord(azimuth, true_alt, coord.distance.au)
+        return self.__hor_coord
+
+    def _fill_frames(self, ecl: EclSpeed, equator: EquatorSpeed, hor: HorCoord):
+        self.__ecl_coord = ecl
+        self.__equator_coord = equator
+        self.__hor_coord = hor
 
     def sign_pos(self) -> (Zodiac, float):
         return self.ecl_coord().sign_pos()
@@ -54,18 +77,22 @@ class NatalObject:
 
     def transits(self) -> dict:
         if self.__transits is None:
-            self.__transits = self.obj.transits(self.birth, self.place)
+            self.__transits = self.obj.transits(self.birth, self.place, precision=self.precision)
         return self.__transits
 
 
 class Natal:
     """Natal chart"""
 
-    def __init__(self, person: str, birth: datetime, place: GeoLocation, celestials: [Celestial]):
+    def __init__(self, person: str, birth: datetime, place: GeoLocation, celestials: [Celestial], *, precompute: bool = False,
+                 precision: Precision | NoneType = None):
         self.person = person
         self.birth = birth
         self.place = place
-        self.celestials = {obj: NatalObject(obj, birth, place) for obj in celestials}
+        self.precision = precision
+        self.celestials = {obj: NatalObject(obj, birth, place, precision) for obj in celestials}
+        if precompute:
+            self.compute()
 
     def __iter__(self):
         for cel in self.celestials:
@@ -74,6 +101,29 @@ class Natal:
     def __getitem__(self, celestial: Celestial) -> NatalObject:
         return self.celestials[celestial]
 
+    def julday(self) -> float:
+        return swe.julday(self.birth.year, self.birth.month, self.birth.day, self.birth.hour + self.birth.minute / 60.)
+
+    def compute(self):
+        """Fill all coordinate frames of every natal object with one ephemeris call per object
+
+        Only the topocentric ecliptic position with speed is taken from Swiss Ephemeris; the equatorial
+        position is its rotation by the true obliquity and the horizontal one follows from the sidereal time.
+        """
+        jd = self.julday()
+        swe.set_topo(self.place.longitude.degrees, self.place.latitude.degrees)
+        precision = Precision.resolve(self.precision)
+        (nutation, _) = swe.calc_ut(jd, swe.ECL_NUT, precision.flags())
+        obliquity = nutation[0] if precision.nutation else nutation[1]
+        armc = swe.sidtime(jd) * 15.0 + self.place.longitude.degrees
+        latitude = self.place.latitude.radians()
+        for cel in self:
+            ecl = cel.obj.swe_ecl_coord(jd, speed=True, precision=precision)
+            pos = (ecl.longitude.degrees, ecl.latitude.degrees, ecl.distance.au,
+                   ecl.longitude_speed.deg_per_day, ecl.latitude_speed.deg_per_day, ecl.distance_speed.au_per_day)
+            equator = EquatorSpeed(*swe.cotrans_sp(pos, -obliquity))
+            cel._fill_frames(ecl, equator, _equator_to_hor(equator, armc, latitude))
+
     def aspects(self, orb: float = 1.01, of=None, to=None):
         if type(of) is list:
             list1 = of
@@ -116,3 +166,12 @@ class Natal:
                         ])
                 timeline[transit_time] = (transit_name, cel.obj)
         return events
+
+
+def chart_longitudes(chart) -> (list, array):
+    """Names and ecliptic longitudes of a chart given as a `Natal`, a mapping of names to longitudes or a list"""
+    if isinstance(chart, Natal):
+        chart = {cel.name: cel.ecl_coord().longitude.degrees for cel in chart}
+    if isinstance(chart, dict):
+        return list(chart.keys()), array('d', chart.values())
+    return list(range(len(chart))), array('d', chart)
@@ -0,0 +1,57 @@
+from types import NoneType
+
+import swisseph as swe
+
+
+class Precision:
+    """Precision policy of ephemeris computations translated into Swiss Ephemeris flags
+
+    The analytical Moshier ephemeris needs no ephemeris files and is accurate to about an arc second
+    for the planets (it does not cover the numbered asteroids). Nutation, aberration with light deflection
+    and light-time may be skipped to trade accuracy for speed; skipping light-time yields the true
+    geometric position (SEFLG_TRUEPOS), which the focal points and apsides use anyway.
+    """
+
+    default = None
+
+    def __init__(self, name: str, *, moshier: bool = False, nutation: bool = True, aberration: bool = True, light_time: bool = True):
+        self.name = name
+        self.moshier = moshier
+        self.nutation = nutation
+        self.aberration = aberration
+        self.light_time = light_time
+
+    def __repr__(self):
+        return f"Precision({self.name})"
+
+    def flags(self) -> int:
+        iflag = swe.FLG_MOSEPH if self.moshier else swe.FLG_SWIEPH
+        if not self.nutation:
+            iflag |= swe.FLG_NONUT
+        if not self.aberration:
+            iflag |= swe.FLG_NOABERR | swe.FLG_NOGDEFL
+        if not self.light_time:
+            iflag |= swe.FLG_TRUEPOS
+        return iflag
+
+    @classmethod
+    def resolve(cls, precision=None):
+        return precision if precision is not None else cls.default
+
+    @classmethod
+    def swe_flags(cls, precision=None) -> int:
+        return cls.resolve(precision).flags()
+
+
+def set_precision(precision: Precision | NoneType):
+    """Set the precision used by all computations that are not given one explicitly"""
+    Precision.default = precision if precision is not None else Precision.Full
+
+
+Precision.Full = Precision("full")
+Precision.TruePos = Precision("true position", light_time=False)
+Precision.Fast = Precision("fast", moshier=True)
+Precision.Rough = Precision("rough", moshier=True, nutation=False, aberration=False, light_time=False)
+
+Precision.all = [Precision.Full, Precision.TruePos, Precision.Fast, Precision.Rough]
+Precision.default = Precision.Full
@@ -0,0 +1,389 @@
+import argparse
+import asyncio
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import json
+import os
+import time
+from types import NoneType
+from urllib.parse import urlsplit, parse_qs
+
+import swisseph as swe
+
+from .celestials import Celestial, Planet
+from .coords import EclCoord
+from .natal import Natal
+from .primitives import GeoLocation
+from .topocentric import Topocentric
+
+DEFAULT_BODIES = ("Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto")
+
+
+def _init_worker(ephe_path: str | NoneType):
+    if ephe_path:
+        swe.set_ephe_path(ephe_path)
+    # open the ephemeris files once so that the first request does not pay for it
+    swe.calc_ut(swe.julday(2000, 1, 1, 12.), swe.SUN)
+
+
+def _warmup() -> int:
+    return os.getpid()
+
+
+def _chart(when: str, lon: float, lat: float, names: tuple) -> dict:
+    natal = Natal("", datetime.fromisoformat(when), GeoLocation(lon, lat), [Planet(name) for name in names], precompute=True)
+    chart = {}
+    for cel in natal:
+        (sign, _) = cel.sign_pos()
+        (house, _) = cel.house_pos()
+        chart[cel.name] = {
+            "ecl": cel.ecl_coord().json(),
+            "equator": cel.equator_coord().json(),
+            "hor": cel.hor_coord().json(),
+            "sign": sign.name,
+            "house": house,
+        }
+    return chart
+
+
+def _transits(when: str, lon: float, lat: float, names: tuple) -> dict:
+    date = datetime.fromisoformat(when)
+    place = GeoLocation(lon, lat)
+    return {
+        name: {event: None if tm is None else str(tm) for (event, tm) in Planet(name).transits(date, place).items()}
+        for name in names
+    }
+
+
+def _positions(when: str, names: tuple, requests: list) -> list:
+    instant = datetime.fromisoformat(when)
+    planets = [Planet(name) for name in names]
+    if len(requests) == 1:
+        (_, lon, lat) = requests[0]
+        jd = swe.julday(instant.year, instant.month, instant.day, instant.hour + instant.minute / 60.)
+        swe.set_topo(lon, lat)
+        return [{planet.name: planet.swe_ecl_coord(jd).json() for planet in planets}]
+    # many locations at one instant: one ephemeris call per body
+    batch = Topocentric(instant, [GeoLocation(lon, lat) for (_, lon, lat) in requests])
+    coords = {planet.name: batch.ecl_coords(planet) for planet in planets}
+    return [{name: coords[name][k].json() for name in coords} for k in range(len(requests))]
+
+
+def _run_batch(jobs: list) -> (int, list):
+    results = [None] * len(jobs)
+    instants = {}
+    for (idx, (kind, when, lon, lat, names)) in enumerate(jobs):
+        try:
+            if kind == "position":
+                results[idx] = {}
+                for name in names:
+                    instants.setdefault((when, name), []).append((idx, lon, lat))
+            elif kind == "chart":
+                results[idx] = _chart(when, lon, lat, names)
+            elif kind == "transits":
+                results[idx] = _transits(when, lon, lat, names)
+        except Exception as e:
+            results[idx] = {"error": str(e)}
+    for ((when, name), requests) in instants.items():
+        try:
+            for ((idx, _, _), result) in zip(requests, _positions(when, (name,), requests)):
+                if "error" not in results[idx]:
+                    results[idx].update(result)
+        except Exception as e:
+            for (idx, _, _) in requests:
+                results[idx] = {"error": str(e)}
+    return os.getpid(), results
+
+
+class LRUCache:
+    """Least recently used cache of computed positions shared by all requests"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.__items = OrderedDict()
+
+    def get(self, key):
+        value = self.__items.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.__items.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.__items[key] = value
+        self.__items.move_to_end(key)
+        if len(self.__items) > self.size:
+            self.__items.popitem(last=False)
+
+    def __len__(self):
+        return len(self.__items)
+
+
+class ServiceStats:
+    """Request rate and latency percentiles of the service"""
+
+    def __init__(self, window: float = 60.0, samples: int = 10000):
+        self.window = window
+        self.started = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched_jobs = 0
+        self.worker_batches = {}
+        self.__times = deque()
+        self.__latencies = deque(maxlen=samples)
+
+    def record(self, latency: float, error: bool = False):
+        self.requests += 1
+        if error:
+            self.errors += 1
+        self.__times.append(time.monotonic())
+        self.__latencies.append(latency)
+
+    def record_batch(self, size: int):
+        self.batches += 1
+        self.batched_jobs += size
+
+    def record_worker(self, pid: int):
+        self.worker_batches[pid] = self.worker_batches.get(pid, 0) + 1
+
+    def json(self) -> dict:
+        now = time.monotonic()
+        while self.__times and self.__times[0] < now - self.window:
+            self.__times.popleft()
+        elapsed = min(self.window, now - self.started) or 1.0
+        latencies = sorted(self.__latencies)
+
+        def percentile(p: float) -> float | NoneType:
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(p / 100.0 * len(latencies)))] * 1000.0
+
+        return {
+            "uptime": now - self.started,
+            "requests": self.requests,
+            "errors": self.errors,
+            "requests_per_sec": len(self.__times) / elapsed,
+            "latency_ms": {"p50": percentile(50), "p90": percentile(90), "p99": percentile(99), "max": percentile(100)},
+            "batches": self.batches,
+            "mean_batch_size": self.batched_jobs / self.batches if self.batches else None,
+            "worker_batches": {str(pid): count for (pid, count) in sorted(self.worker_batches.items())},
+        }
+
+
+class ChartService:
+    """Local chart service batching concurrent requests onto warm worker processes"""
+
+    def __init__(self, *, workers: int | NoneType = None, ephe_path: str | NoneType = None,
+                 window: float = 0.005, max_batch: int = 64, cache_size: int = 100000):
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(ephe_path,))
+        self.window = window
+        self.max_batch = max_batch
+        self.cache = LRUCache(cache_size)
+        self.stats = ServiceStats()
+        self.__pending = []
+        self.__timer = None
+
+    async def warmup(self):
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(self.pool, _warmup) for _ in range(self.workers)])
+
+    def close(self):
+        self.pool.shutdown()
+
+    def submit(self, job: tuple) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.__pending.append((job, future))
+        if len(self.__pending) >= self.max_batch:
+            self.__flush()
+        elif self.__timer is None:
+            self.__timer = loop.call_later(self.window, self.__flush)
+        return future
+
+    def __flush(self):
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+        (batch, self.__pending) = (self.__pending, [])
+        if batch:
+            self.stats.record_batch(len(batch))
+            for part in self.__split(batch):
+                asyncio.ensure_future(self.__run(part))
+
+    def __split(self, batch: list) -> list:
+        """Sub-batches of the micro-batch running concurrently on up to `workers` processes
+
+        The position jobs of one instant stay in the same sub-batch so that they share one `Topocentric`
+        call per body; chart and transit jobs are spread round-robin.
+        """
+        groups = {}
+        for (idx, ((kind, when, _, _, _), _)) in enumerate(batch):
+            groups.setdefault(when if kind == "position" else (kind, idx), []).append(batch[idx])
+        parts = [[] for _ in range(min(self.workers, len(groups)))]
+        for (k, group) in enumerate(groups.values()):
+            parts[k % len(parts)].extend(group)
+        return parts
+
+    async def __run(self, batch: list):
+        loop = asyncio.get_running_loop()
+        try:
+            (pid, results) = await loop.run_in_executor(self.pool, _run_batch, [job for (job, _) in batch])
+            self.stats.record_worker(pid)
+        except Exception as e:
+            results = [{"error": str(e)}] * len(batch)
+        for ((_, future), result) in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def __compute(self, kind: str, when: str, lon: float, lat: float, names: tuple) -> dict:
+        key = (kind, when, lon, lat, names)
+        result = self.cache.get(key)
+        if result is None:
+            result = await self.submit(key)
+            if "error" in result:
+                raise RuntimeError(result["error"])
+            self.cache.put(key, result)
+        return result
+
+    async def chart(self, when: str, lon: float, lat: float, names: tuple) -> dict:
+        chart = await self.__compute("chart", when, lon, lat, names)
+        for (name, obj) in chart.items():
+            ecl = obj["ecl"]
+            self.cache.put(("position", when, lon, lat, (name,)), {name: {key: ecl[key] for key in ("lat", "long", "dist")}})
+        return chart
+
+    async def position(self, when: str, lon: float, lat: float, names: tuple) -> dict:
+        result = {}
+        missing = []
+        for name in names:
+            cached = self.cache.get(("position", when, lon, lat, (name,)))
+            if cached is None:
+                missing.append(name)
+            else:
+                result.update(cached)
+        if missing:
+            # all missing bodies go to the workers as one job of one micro-batch
+            computed = await self.submit(("position", when, lon, lat, tuple(missing)))
+            if "error" in computed:
+                raise RuntimeError(computed["error"])
+            for (name, coord) in computed.items():
+                self.cache.put(("position", when, lon, lat, (name,)), {name: coord})
+            result.update(computed)
+        return {name: result[name] for name in names}
+
+    async def aspects(self, when: str, lon: float, lat: float, names: tuple, orb: float) -> list:
+        chart = await self.chart(when, lon, lat, names)
+        coords = [(name, EclCoord(obj["ecl"]["long"], obj["ecl"]["lat"], obj["ecl"]["dist"])) for (name, obj) in chart.items()]
+        aspects = []
+        for (i1, (name1, coord1)) in enumerate(coords):
+            for (name2, coord2) in coords[:i1]:
+                aspect = (coord1 ^ coord2).aspect(orb=orb)
+                if aspect is not None:
+                    aspects.append({"first": name1, "second": name2, "aspect": aspect})
+        return aspects
+
+    async def transits(self, when: str, lon: float, lat: float, names: tuple) -> dict:
+        return await self.__compute("transits", when, lon, lat, names)
+
+    async def dispatch(self, target: str) -> (int, dict | list):
+        url = urlsplit(target)
+        if url.path == "/stats":
+            stats = self.stats.json()
+            stats["cache"] = {"size": len(self.cache), "hits": self.cache.hits, "misses": self.cache.misses}
+            stats["workers"] = self.workers
+            return 200, stats
+        params = {key: values[-1] for (key, values) in parse_qs(url.query).items()}
+        try:
+            when = datetime.fromisoformat(params.get("time") or params["date"]).isoformat()
+            lon = float(params.get("lon", 0.0))
+            lat = float(params.get("lat", 0.0))
+            names = tuple(name for name in (params.get("bodies") or params.get("body") or ",".join(DEFAULT_BODIES)).split(",") if name)
+            for name in names:
+                Celestial.swe_id_by_name(name)
+        except Exception as e:
+            return 400, {"error": f"bad request: {e}"}
+        try:
+            if url.path == "/chart":
+                return 200, await self.chart(when, lon, lat, names)
+            elif url.path == "/position":
+                return 200, await self.position(when, lon, lat, names)
+            elif url.path == "/aspects":
+                return 200, await self.aspects(when, lon, lat, names, float(params.get("orb", 1.01)))
+            elif url.path == "/transits":
+                return 200, await self.transits(when, lon, lat, names)
+        except Exception as e:
+            return 500, {"error": str(e)}
+        return 404, {"error": f"unknown endpoint {url.path}"}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request = await reader.readline()
+                if not request:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    (key, _, value) = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                (method, target, version) = request.decode("latin-1").split()
+                started = time.perf_counter()
+                if method != "GET":
+                    (status, body) = (405, {"error": "only GET is supported"})
+                else:
+                    (status, body) = await self.dispatch(target)
+                if not target.startswith("/stats"):
+                    self.stats.record(time.perf_counter() - started, error=status != 200)
+                payload = json.dumps(body).encode()
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"{version} {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8000, **kwargs):
+    service = ChartService(**kwargs)
+    await service.warmup()
+    server = await asyncio.start_server(service.handle, host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local astrolog chart service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: CPU count)")
+    parser.add_argument("--ephe-path", default=None, help="directory with Swiss Ephemeris files")
+    parser.add_argument("--window", type=float, default=0.005, help="micro-batching window in seconds")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--cache-size", type=int, default=100000)
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port, workers=args.workers, ephe_path=args.ephe_path,
+                      window=args.window, max_batch=args.max_batch, cache_size=args.cache_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+from array import array
+from datetime import datetime
+import math
+from types import NoneType
+
+import swisseph as swe
+
+from .celestials import FixedCelestial
+from .coords import EclCoord, EquatorCoord
+from .natal import Natal
+from .precision import Precision
+
+# General precession in longitude, degrees per day
+PRECESSION_RATE = 5028.796195 / 3600.0 / 36525.0
+# Constant of annual aberration, degrees
+ABERRATION = 20.49552 / 3600.0
+
+
+def _unit(lng: float, lat: float) -> (float, float, float):
+    lng = math.radians(lng)
+    lat = math.radians(lat)
+    return math.cos(lat) * math.cos(lng), math.cos(lat) * math.sin(lng), math.sin(lat)
+
+
+class _Grid:
+    """Bands of equal latitude split into cells of roughly equal area"""
+
+    def __init__(self, lngs: array, lats: array, cell: float):
+        self.cell = cell
+        self.bands = int(math.ceil(180.0 / cell))
+        self.columns = []
+        for band in range(self.bands):
+            lat = min(abs(-90.0 + band * cell), abs(-90.0 + (band + 1) * cell))
+            self.columns.append(max(1, int(360.0 * math.cos(math.radians(lat)) / cell)))
+        self.cells = {}
+        self.lngs = lngs
+        self.lats = lats
+        xs = array('d')
+        ys = array('d')
+        zs = array('d')
+        for (idx, (lng, lat)) in enumerate(zip(lngs, lats)):
+            self.cells.setdefault(self.__cell(lng, lat), []).append(idx)
+            (x, y, z) = _unit(lng, lat)
+            xs.append(x)
+            ys.append(y)
+            zs.append(z)
+        self.xs = xs
+        self.ys = ys
+        self.zs = zs
+
+    def __band(self, lat: float) -> int:
+        return min(self.bands - 1, max(0, int((lat + 90.0) / self.cell)))
+
+    def __cell(self, lng: float, lat: float) -> (int, int):
+        band = self.__band(lat)
+        return band, int((lng % 360.0) / 360.0 * self.columns[band]) % self.columns[band]
+
+    def candidates(self, lng: float, lat: float, radius: float):
+        for band in range(self.__band(lat - radius), self.__band(lat + radius) + 1):
+            columns = self.columns[band]
+            edge = max(abs(lat) + radius, abs(-90.0 + band * self.cell), abs(-90.0 + (band + 1) * self.cell))
+            if edge >= 89.0 or columns == 1:
+                cols = range(columns)
+            else:
+                half = radius / math.cos(math.radians(edge))
+                if half >= 180.0:
+                    cols = range(columns)
+                else:
+                    first = int(math.floor((lng - half) / 360.0 * columns))
+                    last = int(math.floor((lng + half) / 360.0 * columns))
+                    cols = {col % columns for col in range(first, last + 1)}
+            for col in cols:
+                yield from self.cells.get((band, col), ())
+
+    def within(self, lng: float, lat: float, radius: float) -> [(int, float)]:
+        (x, y, z) = _unit(lng, lat)
+        chord2 = (2.0 * math.sin(math.radians(min(radius, 180.0)) / 2.0)) ** 2
+        found = []
+        for idx in self.candidates(lng, lat, radius):
+            dist2 = (self.xs[idx] - x) ** 2 + (self.ys[idx] - y) ** 2 + (self.zs[idx] - z) ** 2
+            if dist2 <= chord2:
+                found.append((idx, math.degrees(2.0 * math.asin(min(1.0, math.sqrt(dist2) / 2.0)))))
+        found.sort(key=lambda match: match[1])
+        return found
+
+
+class StarIndex:
+    """Spatial index over fixed star positions for an epoch answering radius and nearest neighbour queries
+
+    Mean positions (without nutation and aberration) are computed once per star with Swiss Ephemeris;
+    `refresh` moves them to another epoch by precession in longitude and adds the nutation and annual
+    aberration of that epoch, so the index holds apparent positions comparable with the planets. Proper
+    motion and the slow motion of the ecliptic are left out, which keeps a refresh within a few arc
+    seconds over a few years from the build. `rebuild` recomputes every star.
+    """
+
+    def __init__(self, stars: [FixedCelestial], time: datetime, *, cell: float = 2.0, precision: Precision | NoneType = None):
+        self.stars = stars
+        self.cell = cell
+        self.precision = precision
+        self.rebuild(time)
+
+    @classmethod
+    def from_names(cls, names: [str], time: datetime, **kwargs):
+        return cls([FixedCelestial(name, name) for name in names], time, **kwargs)
+
+    def rebuild(self, time: datetime):
+        self.swe_rebuild(swe.julday(time.year, time.month, time.day, time.hour + time.minute / 60.))
+
+    def swe_rebuild(self, jd: float):
+        iflag = Precision.swe_flags(self.precision) | swe.FLG_NONUT | swe.FLG_NOABERR | swe.FLG_NOGDEFL
+        self.base_jd = jd
+        self.base_lngs = array('d')
+        self.lats = array('d')
+        for star in self.stars:
+            (ecl, _, _) = swe.fixstar_ut(star.swe_id(), jd, iflag)
+            self.base_lngs.append(ecl[0])
+            self.lats.append(ecl[1])
+        self.swe_refresh(jd)
+
+    def refresh(self, time: datetime):
+        self.swe_refresh(swe.julday(time.year, time.month, time.day, time.hour + time.minute / 60.))
+
+    def swe_refresh(self, jd: float):
+        self.jd = jd
+        shift = (jd - self.base_jd) * PRECESSION_RATE
+        precision = Precision.resolve(self.precision)
+        (nutation, _) = swe.calc_ut(jd, swe.ECL_NUT, precision.flags())
+        self.obliquity = nutation[0] if precision.nutation else nutation[1]
+        if precision.nutation:
+            shift += nutation[2]
+        lngs = array('d', [lng + shift for lng in self.base_lngs])
+        lats = array('d', self.lats)
+        if precision.aberration:
+            (sun, _) = swe.calc_ut(jd, swe.SUN, precision.flags())
+            sun = math.radians(sun[0])
+            for (idx, (lng, lat)) in enumerate(zip(lngs, lats)):
+                (diff, beta) = (sun - math.radians(lng), math.radians(lat))
+                lngs[idx] = lng - ABERRATION * math.cos(diff) / max(math.cos(beta), 1e-6)
+                lats[idx] = lat - ABERRATION * math.sin(diff) * math.sin(beta)
+        lngs = array('d', [lng % 360.0 for lng in lngs])
+        self.__ecl = _Grid(lngs, lats, self.cell)
+        self.__equator = None
+
+    def __grid(self, frame: str) -> _Grid:
+        if frame == "ecl":
+            return self.__ecl
+        if frame != "equator":
+            raise RuntimeError(f"unknown frame {frame}")
+        if self.__equator is None:
+            eps = math.radians(self.obliquity)
+            (cos_eps, sin_eps) = (math.cos(eps), math.sin(eps))
+            ras = array('d')
+            decls = array('d')
+            for (x, y, z) in zip(self.__ecl.xs, self.__ecl.ys, self.__ecl.zs):
+                (y, z) = (y * cos_eps - z * sin_eps, y * sin_eps + z * cos_eps)
+                ras.append(math.degrees(math.atan2(y, x)) % 360.0)
+                decls.append(math.degrees(math.asin(max(-1.0, min(1.0, z)))))
+            self.__equator = _Grid(ras, decls, self.cell)
+        return self.__equator
+
+    @staticmethod
+    def __point(coord: EclCoord | EquatorCoord | tuple, frame: str | NoneType) -> (float, float, str):
+        if isinstance(coord, EclCoord):
+            return coord.longitude.degrees, coord.latitude.degrees, frame or "ecl"
+        if isinstance(coord, EquatorCoord):
+            return coord.ra.degrees, coord.decl.degrees, frame or "equator"
+        (lng, lat) = coord
+        return lng, lat, frame or "ecl"
+
+    def within(self, coord: EclCoord | EquatorCoord | tuple, radius: float = 1.0, *, frame: str | NoneType = None) -> [(FixedCelestial, float)]:
+        (lng, lat, frame) = self.__point(coord, frame)
+        return [(self.stars[idx], sep) for (idx, sep) in self.__grid(frame).within(lng, lat, radius)]
+
+    def nearest(self, coord: EclCoord | EquatorCoord | tuple, k: int = 1, *, frame: str | NoneType = None) -> [(FixedCelestial, float)]:
+        (lng, lat, frame) = self.__point(coord, frame)
+        grid = self.__grid(frame)
+        radius = self.cell
+        while True:
+            found = grid.within(lng, lat, radius)
+            if len(found) >= k or radius >= 180.0:
+                return [(self.stars[idx], sep) for (idx, sep) in found[:k]]
+            radius *= 2.0
+
+    def within_many(self, coords: dict | list, radius: float = 1.0, *, frame: str | NoneType = None) -> dict | list:
+        if isinstance(coords, dict):
+            return {key: self.within(coord, radius, frame=frame) for (key, coord) in coords.items()}
+        return [self.within(coord, radius, frame=frame) for coord in coords]
+
+    def conjunctions(self, natal: Natal, radius: float = 1.0) -> dict:
+        return self.within_many({cel.name: cel.ecl_coord() for cel in natal}, radius)
+
+    def bulk_conjunctions(self, charts, radius: float = 1.0):
+        """Conjunctions for many charts, each given as a `Natal` or a mapping of names to coordinates"""
+        for chart in charts:
+            if isinstance(chart, Natal):
+                yield self.conjunctions(chart, radius)
+            else:
+                yield self.within_many(chart, radius)
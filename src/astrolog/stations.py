@@ -0,0 +1,173 @@
+from array import array
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+import json
+import sys
+from types import NoneType
+
+import swisseph as swe
+
+from .celestials import Planet
+from .precision import Precision
+
+J2000 = 2451545.0
+J2000_TIME = datetime(2000, 1, 1, 12)
+
+
+def julday(time: datetime) -> float:
+    """Julian day of the time computed without Swiss Ephemeris
+
+    Naive times are taken as UTC, aware times are converted to UTC. Unlike the `swe.julday` calls
+    elsewhere in the package, which pass `hour + minute / 60`, seconds and microseconds are kept.
+    """
+    if time.tzinfo is not None:
+        time = time.astimezone(timezone.utc).replace(tzinfo=None)
+    return J2000 + (time - J2000_TIME) / timedelta(days=1)
+
+
+def revjul(jd: float) -> datetime:
+    """Naive UTC time of the julian day"""
+    return J2000_TIME + timedelta(days=jd - J2000)
+
+
+class StationCalendar:
+    """Precomputed stations of the planets answering retrograde queries by bisection"""
+
+    def __init__(self, start: float, end: float, stations: dict[str, array], retrograde: dict[str, bool]):
+        self.start = start
+        self.end = end
+        self.stations = stations
+        self.retrograde = retrograde
+
+    @classmethod
+    def compute(cls, planets: [Planet], start: datetime, end: datetime, *, step: float = 1.0, tolerance: float = 1e-5,
+                precision: Precision | NoneType = None):
+        jd_start = julday(start)
+        jd_end = julday(end)
+        stations = {}
+        retrograde = {}
+        for planet in planets:
+            speed = cls.__speed_func(planet, precision)
+            times = array('d')
+            jd = jd_start
+            prev = speed(jd)
+            retrograde[planet.name] = prev < 0
+            while jd < jd_end:
+                nxt_jd = min(jd + step, jd_end)
+                nxt = speed(nxt_jd)
+                if (prev < 0) != (nxt < 0):
+                    times.append(cls.__find_zero(speed, jd, nxt_jd, prev, tolerance))
+                jd = nxt_jd
+                prev = nxt
+            stations[planet.name] = times
+        return cls(jd_start, jd_end, stations, retrograde)
+
+    @staticmethod
+    def __speed_func(planet: Planet, precision: Precision | NoneType):
+        swe_code = planet.swe_id()
+        iflag = Precision.swe_flags(precision) | swe.FLG_SPEED
+
+        def speed(jd: float) -> float:
+            (ecl, _) = swe.calc_ut(jd, swe_code, iflag)
+            return ecl[3]
+        return speed
+
+    @staticmethod
+    def __find_zero(speed, lo: float, hi: float, lo_speed: float, tolerance: float) -> float:
+        while hi - lo > tolerance:
+            mid = (lo + hi) / 2.0
+            mid_speed = speed(mid)
+            if (mid_speed < 0) == (lo_speed < 0):
+                lo = mid
+                lo_speed = mid_speed
+            else:
+                hi = mid
+        return (lo + hi) / 2.0
+
+    def __check(self, name: str, jd: float):
+        if name not in self.stations:
+            raise RuntimeError(f"{name} is not in the station calendar")
+        if not self.start <= jd <= self.end:
+            raise RuntimeError(f"julian day {jd} is outside of the station calendar range")
+
+    @staticmethod
+    def __name(planet: Planet | str) -> str:
+        return planet if type(planet) is str else planet.name
+
+    def swe_is_retrograde(self, planet: Planet | str, jd: float) -> bool:
+        name = self.__name(planet)
+        self.__check(name, jd)
+        count = bisect_right(self.stations[name], jd)
+        return self.retrograde[name] != (count % 2 == 1)
+
+    def is_retrograde(self, planet: Planet | str, time: datetime) -> bool:
+        return self.swe_is_retrograde(planet, julday(time))
+
+    def swe_retrograde_periods(self, planet: Planet | str, jd1: float, jd2: float) -> [(float, float)]:
+        """Retrograde periods overlapping the range, clipped to it"""
+        name = self.__name(planet)
+        self.__check(name, jd1)
+        self.__check(name, jd2)
+        times = self.stations[name]
+        idx = bisect_right(times, jd1)
+        retro = self.retrograde[name] != (idx % 2 == 1)
+        begin = times[idx - 1] if idx > 0 else self.start
+        periods = []
+        while True:
+            end = times[idx] if idx < len(times) else self.end
+            if retro:
+                periods.append((max(begin, jd1), min(end, jd2)))
+            if end >= jd2 or idx >= len(times):
+                break
+            begin = end
+            idx += 1
+            retro = not retro
+        return periods
+
+    def retrograde_periods(self, planet: Planet | str, start: datetime, end: datetime) -> [(datetime, datetime)]:
+        periods = self.swe_retrograde_periods(planet, julday(start), julday(end))
+        return [(revjul(begin), revjul(end)) for (begin, end) in periods]
+
+    def swe_stations(self, planet: Planet | str, jd1: float, jd2: float):
+        name = self.__name(planet)
+        self.__check(name, jd1)
+        self.__check(name, jd2)
+        return self.__stations(name, jd1, jd2)
+
+    def __stations(self, name: str, jd1: float, jd2: float):
+        times = self.stations[name]
+        idx = bisect_right(times, jd1)
+        retro = self.retrograde[name] != (idx % 2 == 1)
+        while idx < len(times) and times[idx] <= jd2:
+            retro = not retro
+            yield times[idx], "retrograde" if retro else "direct"
+            idx += 1
+
+    def station_times(self, planet: Planet | str, start: datetime, end: datetime) -> list:
+        return [{"time": revjul(jd), "station": station} for (jd, station) in self.swe_stations(planet, julday(start), julday(end))]
+
+    def dump(self, fp):
+        header = {
+            "start": self.start,
+            "end": self.end,
+            "byteorder": sys.byteorder,
+            "planets": [{"name": name, "retrograde": self.retrograde[name], "count": len(times)}
+                        for (name, times) in self.stations.items()],
+        }
+        fp.write(json.dumps(header).encode() + b"\n")
+        for times in self.stations.values():
+            times.tofile(fp)
+
+    @classmethod
+    def load(cls, fp):
+        header = json.loads(fp.readline())
+        stations = {}
+        retrograde = {}
+        for planet in header["planets"]:
+            times = array('d')
+            times.fromfile(fp, planet["count"])
+            if header["byteorder"] != sys.byteorder:
+                times.byteswap()
+            stations[planet["name"]] = times
+            retrograde[planet["name"]] = planet["retrograde"]
+        return cls(header["start"], header["end"], stations, retrograde)
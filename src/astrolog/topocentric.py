@@ -0,0 +1,125 @@
+from array import array
+from datetime import datetime
+import math
+from types import NoneType
+
+import swisseph as swe
+
+from .celestials import Celestial, Planet, FixedCelestial
+from .coords import EclCoord, EquatorCoord
+from .precision import Precision
+from .primitives import GeoLocation
+
+# Earth figure used by Swiss Ephemeris for topocentric positions (IERS 2003)
+EARTH_RADIUS = 6378136.6
+EARTH_OBLATENESS = 1.0 / 298.25642
+AU = 149597870700.0
+
+# Maximal expected deviation from swe.calc_ut(..., FLG_TOPOCTR) in arc seconds: the analytical
+# correction neglects the diurnal aberration (at most 0.32") and the light-time change over one Earth radius
+TOLERANCE = 1.0
+
+
+def _polar(x: float, y: float, z: float) -> (float, float, float):
+    dist = math.sqrt(x * x + y * y + z * z)
+    return math.degrees(math.atan2(y, x)) % 360.0, math.degrees(math.asin(z / dist)), dist
+
+
+class Topocentric:
+    """Topocentric positions of the bodies for many locations at one instant
+
+    Each body is computed geocentrically once; diurnal parallax is applied analytically for every location
+    by subtracting the observer's geocentric position vector in the true equator of date. The per-location
+    work is a plain Python loop without any ephemeris call.
+    """
+
+    def __init__(self, time: datetime, locations: [GeoLocation], altitude: float = 0.0, precision: Precision | NoneType = None):
+        self.time = time
+        self.locations = locations
+        self.altitude = altitude
+        self.precision = Precision.resolve(precision)
+        self.jd = swe.julday(time.year, time.month, time.day, time.hour + time.minute / 60.)
+        (nutation, _) = swe.calc_ut(self.jd, swe.ECL_NUT, self.precision.flags())
+        self.obliquity = nutation[0] if self.precision.nutation else nutation[1]
+        gst = swe.sidtime(self.jd) * 15.0
+        self.observers = [self.__observer(location, gst) for location in locations]
+
+    def __observer(self, location: GeoLocation, gst: float) -> (float, float, float):
+        lat = location.latitude.radians()
+        lst = math.radians(gst + location.longitude.degrees)
+        flat = (1.0 - EARTH_OBLATENESS) ** 2
+        c = 1.0 / math.sqrt(math.cos(lat) ** 2 + flat * math.sin(lat) ** 2)
+        rho_cos = (EARTH_RADIUS * c + self.altitude) * math.cos(lat) / AU
+        rho_sin = (EARTH_RADIUS * c * flat + self.altitude) * math.sin(lat) / AU
+        return rho_cos * math.cos(lst), rho_cos * math.sin(lst), rho_sin
+
+    def __geocentric(self, celestial: Celestial) -> (float, float, float):
+        if isinstance(celestial, Planet):
+            (equator, _) = celestial.swe_calc(self.jd, swe.FLG_EQUATORIAL, precision=self.precision)
+        elif isinstance(celestial, FixedCelestial):
+            (equator, _, _) = swe.fixstar_ut(celestial.swe_id(), self.jd, self.precision.flags() | swe.FLG_EQUATORIAL)
+        else:
+            raise RuntimeError(f"topocentric batch is not supported for {celestial.name}")
+        return equator[0], equator[1], equator[2]
+
+    def __vectors(self, celestial: Celestial):
+        (ra, decl, dist) = self.__geocentric(celestial)
+        ra = math.radians(ra)
+        decl = math.radians(decl)
+        x = dist * math.cos(decl) * math.cos(ra)
+        y = dist * math.cos(decl) * math.sin(ra)
+        z = dist * math.sin(decl)
+        if isinstance(celestial, FixedCelestial):
+            # parallax of fixed objects is negligible
+            return [(x, y, z)] * len(self.observers)
+        return [(x - ox, y - oy, z - oz) for (ox, oy, oz) in self.observers]
+
+    def swe_equator_arrays(self, celestial: Celestial) -> (array, array, array):
+        ras = array('d')
+        decls = array('d')
+        dists = array('d')
+        for (x, y, z) in self.__vectors(celestial):
+            (ra, decl, dist) = _polar(x, y, z)
+            ras.append(ra)
+            decls.append(decl)
+            dists.append(dist)
+        return ras, decls, dists
+
+    def swe_ecl_arrays(self, celestial: Celestial) -> (array, array, array):
+        eps = math.radians(self.obliquity)
+        (cos_eps, sin_eps) = (math.cos(eps), math.sin(eps))
+        longitudes = array('d')
+        latitudes = array('d')
+        dists = array('d')
+        for (x, y, z) in self.__vectors(celestial):
+            (lng, lat, dist) = _polar(x, y * cos_eps + z * sin_eps, z * cos_eps - y * sin_eps)
+            longitudes.append(lng)
+            latitudes.append(lat)
+            dists.append(dist)
+        return longitudes, latitudes, dists
+
+    def equator_coords(self, celestial: Celestial) -> [EquatorCoord]:
+        return [EquatorCoord(*pos) for pos in zip(*self.swe_equator_arrays(celestial))]
+
+    def ecl_coords(self, celestial: Celestial) -> [EclCoord]:
+        return [EclCoord(*pos) for pos in zip(*self.swe_ecl_arrays(celestial))]
+
+    def max_error(self, celestial: Celestial) -> float:
+        """Largest deviation in arc seconds from the per-location Swiss Ephemeris topocentric positions"""
+        error = 0.0
+        coords = self.ecl_coords(celestial)
+        for (location, coord) in zip(self.locations, coords):
+            swe.set_topo(location.longitude.degrees, location.latitude.degrees, self.altitude)
+            expected = celestial.swe_ecl_coord(self.jd, precision=self.precision)
+            dlng = (coord.longitude.degrees - expected.longitude.degrees + 180.0) % 360.0 - 180.0
+            dlat = coord.latitude.degrees - expected.latitude.degrees
+            error = max(error, math.hypot(dlng * math.cos(expected.latitude.radians()), dlat) * 3600.0)
+        return error
+
+    def validate(self, celestials: [Celestial], tolerance: float = TOLERANCE) -> dict:
+        """Check the analytical positions against Swiss Ephemeris, raising when a body exceeds the tolerance"""
+        errors = {celestial.name: self.max_error(celestial) for celestial in celestials}
+        for (name, error) in errors.items():
+            if error > tolerance:
+                raise RuntimeError(f"topocentric position of {name} is off by {error:.3f}\" (tolerance {tolerance}\")")
+        return errors